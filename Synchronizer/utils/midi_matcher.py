@@ -19,12 +19,28 @@ import sys
 import os
 from pathlib import Path
 from dataclasses import dataclass
-from typing import List, Dict, Tuple, Optional, Set
+from typing import List, Dict, Tuple, Optional, Set, FrozenSet
 import json
 import math
+from bisect import bisect_left, bisect_right
+from functools import lru_cache
 
 
-@dataclass
+# Pitch class names indexed by MIDI pitch % 12
+PITCH_CLASS_NAMES = ('C', 'C#', 'D', 'D#', 'E', 'F', 'F#', 'G', 'G#', 'A', 'A#', 'B')
+
+# Instrument families recognized when scoring instrument context
+INSTRUMENT_FAMILIES = ('flute', 'violin', 'piano', 'cello')
+
+
+@lru_cache(maxsize=None)
+def _instrument_families(name: str) -> FrozenSet[str]:
+    """Classify an instrument/part name into the families it mentions (cached per name)"""
+    name = name.lower()
+    return frozenset(family for family in INSTRUMENT_FAMILIES if family in name)
+
+
+@dataclass(slots=True)
 class MIDINote:
     """MIDI note representation with precise timing"""
     pitch: int              # MIDI note number (60 = C4)
@@ -41,13 +57,12 @@ class MIDINote:
     @property
     def pitch_name(self) -> str:
         """Convert MIDI pitch to note name (e.g., 60 -> C4)"""
-        notes = ['C', 'C#', 'D', 'D#', 'E', 'F', 'F#', 'G', 'G#', 'A', 'A#', 'B']
         octave = self.pitch // 12 - 1
-        note = notes[self.pitch % 12]
+        note = PITCH_CLASS_NAMES[self.pitch % 12]
         return f"{note}{octave}"
 
 
-@dataclass
+@dataclass(slots=True)
 class MusicXMLNote:
     """MusicXML note representation for matching"""
     pitch: str              # "A4", "C#3", etc.
@@ -104,7 +119,7 @@ class MusicXMLNote:
         return midi_number
 
 
-@dataclass
+@dataclass(slots=True)
 class NoteMatch:
     """Represents a matched XML-MIDI note pair with confidence scoring"""
     xml_note: MusicXMLNote
@@ -135,18 +150,49 @@ class MIDIMatcher:
         """
         self.tolerance_seconds = tolerance_ms / 1000.0
         self.strict_pitch = strict_pitch
-        self.matched_midi_notes: Set[str] = set()  # Track used MIDI notes
-        self.matched_xml_notes: Set[str] = set()   # Track used XML notes
+        self.matched_midi_notes: Set[str] = set()  # Track used MIDI notes (by note_id)
+        self.matched_xml_notes: Set[int] = set()   # Track used XML notes (by identity)
+        
+        # Prepared MIDI state (see prepare())
+        self._midi_notes: List[MIDINote] = []
+        self._midi_index: Dict[int, Tuple[List[float], List[int]]] = {}
+        self._midi_used = bytearray()  # 1 per prepared MIDI note already matched
+        self._midi_positions_by_id: Dict[str, List[int]] = {}  # note_id -> positions
         
         print(f"🎯 MIDI MATCHER INITIALIZED")
         print(f"⏱️  Tolerance: {tolerance_ms}ms ({self.tolerance_seconds:.3f}s)")
         print(f"🎵 Strict pitch matching: {strict_pitch}")
         print()
     
+    def prepare(self, midi_notes: List[MIDINote]):
+        """
+        Index MIDI notes once so repeated matching calls can reuse the work.
+        
+        Buckets MIDI notes by pitch (onsets sorted for bisect lookups). The
+        index is a snapshot of the list: call prepare() again after adding,
+        removing or retiming notes. Used notes are tracked by note_id: matching
+        a note excludes every note sharing its note_id, across calls and
+        re-prepares, until reset_matching_state().
+        
+        Args:
+            midi_notes: List of MIDI notes to match against
+        """
+        positions_by_id: Dict[str, List[int]] = {}
+        for position, midi_note in enumerate(midi_notes):
+            positions_by_id.setdefault(midi_note.note_id, []).append(position)
+        
+        self._midi_notes = midi_notes
+        self._midi_index = self._index_midi_notes(midi_notes)
+        self._midi_positions_by_id = positions_by_id
+        self._midi_used = bytearray(len(midi_notes))
+        for note_id in self.matched_midi_notes:
+            for position in positions_by_id.get(note_id, ()):
+                self._midi_used[position] = 1
+    
     def match_notes_with_tolerance(
         self, 
         xml_notes: List[MusicXMLNote], 
-        midi_notes: List[MIDINote],
+        midi_notes: Optional[List[MIDINote]] = None,
         min_confidence: float = 0.5
     ) -> List[NoteMatch]:
         """
@@ -154,16 +200,21 @@ class MIDIMatcher:
         
         Args:
             xml_notes: List of MusicXML notes to match
-            midi_notes: List of MIDI notes to match against
+            midi_notes: List of MIDI notes to match against; re-prepared on
+                every call when given. Omit it to reuse the notes from the last
+                prepare() without re-indexing
             min_confidence: Minimum confidence threshold for matches
             
         Returns:
             List of NoteMatch objects with confidence scoring
         """
+        if midi_notes is not None:
+            self.prepare(midi_notes)
+        
         print(f"MIDI TOLERANCE MATCHING")
         print("=" * 50)
         print(f"🎼 XML notes to match: {len(xml_notes)}")
-        print(f"🎹 MIDI notes available: {len(midi_notes)}")
+        print(f"🎹 MIDI notes available: {len(self._midi_notes)}")
         print(f"🎯 Minimum confidence: {min_confidence}")
         print()
         
@@ -174,19 +225,25 @@ class MIDIMatcher:
         sorted_xml_notes = sorted(xml_notes, key=lambda x: x.onset_time)
         
         for xml_note in sorted_xml_notes:
+            # Resolve the pitch string once per note rather than per candidate
+            xml_pitch = xml_note.pitch_midi
+            
             # Find candidate MIDI notes within tolerance
-            candidates = self._find_candidate_matches(xml_note, midi_notes)
+            candidates = self._find_candidate_matches(xml_note, xml_pitch)
             
             if candidates:
                 # Score all candidates and select the best
-                best_match = self._select_best_match(xml_note, candidates)
+                best_match, _ = self._select_best_match(xml_note, xml_pitch, candidates)
                 
                 if best_match and best_match.confidence >= min_confidence:
                     matches.append(best_match)
-                    # Mark notes as used to avoid double-matching
-                    self.matched_midi_notes.add(best_match.midi_note.note_id)
-                    xml_id = f"{xml_note.part_id}_{xml_note.measure_number}_{xml_note.beat_position}_{xml_note.pitch}"
-                    self.matched_xml_notes.add(xml_id)
+                    # Mark notes as used to avoid double-matching (every note
+                    # sharing the matched note_id counts as used)
+                    note_id = best_match.midi_note.note_id
+                    for position in self._midi_positions_by_id[note_id]:
+                        self._midi_used[position] = 1
+                    self.matched_midi_notes.add(note_id)
+                    self.matched_xml_notes.add(id(xml_note))
                     
                     print(f"✅ MATCH: {xml_note.pitch} @ {xml_note.onset_time:.3f}s → "
                           f"MIDI {best_match.midi_note.pitch_name} @ {best_match.midi_note.start_time:.3f}s "
@@ -215,59 +272,109 @@ class MIDIMatcher:
         print()
         return matches
     
+    def _index_midi_notes(
+        self, 
+        midi_notes: List[MIDINote]
+    ) -> Dict[int, Tuple[List[float], List[int]]]:
+        """Bucket MIDI note positions by pitch, sorted by onset for bisect lookups"""
+        buckets: Dict[int, List[Tuple[float, int]]] = {}
+        for position, midi_note in enumerate(midi_notes):
+            buckets.setdefault(midi_note.pitch, []).append((midi_note.start_time, position))
+        
+        index = {}
+        for pitch, entries in buckets.items():
+            entries.sort()
+            index[pitch] = ([start for start, _ in entries], [position for _, position in entries])
+        return index
+    
     def _find_candidate_matches(
         self, 
         xml_note: MusicXMLNote, 
-        midi_notes: List[MIDINote]
-    ) -> List[MIDINote]:
-        """Find MIDI notes that could potentially match the XML note"""
-        candidates = []
-        
-        for midi_note in midi_notes:
-            # Skip if already matched
-            if midi_note.note_id in self.matched_midi_notes:
+        xml_pitch: int
+    ) -> List[int]:
+        """Find positions of prepared MIDI notes that could potentially match the XML note"""
+        # Bind hot attributes to locals once rather than per iteration
+        tolerance = self.tolerance_seconds
+        onset = xml_note.onset_time
+        midi_index = self._midi_index
+        midi_notes = self._midi_notes
+        used = self._midi_used
+        
+        # Check pitch matching
+        if self.strict_pitch:
+            pitches = (xml_pitch,)
+        else:
+            # Allow some pitch variation (e.g., octave errors) up to one octave
+            pitches = range(xml_pitch - 12, xml_pitch + 13)
+        
+        # Collect positions whose onset falls in the tolerance window; the window
+        # is padded slightly and re-checked exactly to avoid float rounding misses
+        window_start = onset - tolerance - 1e-9
+        window_end = onset + tolerance + 1e-9
+        positions = []
+        extend = positions.extend
+        for pitch in pitches:
+            bucket = midi_index.get(pitch)
+            if bucket is None:
                 continue
-            
-            # Check pitch matching
-            if self.strict_pitch:
-                if xml_note.pitch_midi != midi_note.pitch:
-                    continue
-            else:
-                # Allow some pitch variation (e.g., octave errors)
-                pitch_diff = abs(xml_note.pitch_midi - midi_note.pitch)
-                if pitch_diff > 12:  # More than one octave difference
-                    continue
-            
-            # Check timing within tolerance
-            time_diff = abs(xml_note.onset_time - midi_note.start_time)
-            if time_diff <= self.tolerance_seconds:
-                candidates.append(midi_note)
+            starts, bucket_positions = bucket
+            extend(bucket_positions[bisect_left(starts, window_start):bisect_right(starts, window_end)])
         
-        return candidates
+        # Preserve original MIDI ordering so ties resolve as before
+        positions.sort()
+        
+        # Skip already matched notes and check timing within tolerance
+        return [
+            position for position in positions
+            if not used[position] and abs(onset - midi_notes[position].start_time) <= tolerance
+        ]
     
     def _select_best_match(
         self, 
         xml_note: MusicXMLNote, 
-        candidates: List[MIDINote]
-    ) -> Optional[NoteMatch]:
-        """Select the best candidate match using multi-factor scoring"""
+        xml_pitch: int,
+        candidates: List[int]
+    ) -> Tuple[Optional[NoteMatch], int]:
+        """Select the best candidate match using multi-factor scoring, with its MIDI position"""
         if not candidates:
-            return None
-        
-        scored_candidates = []
+            return None, -1
+        
+        # Visit candidates closest in time first; timing is the only factor that
+        # varies monotonically, so once the best score beats the ceiling any
+        # remaining candidate could reach (perfect pitch and context), stop.
+        midi_notes = self._midi_notes
+        onset = xml_note.onset_time
+        tolerance = self.tolerance_seconds
+        ordered = sorted(
+            candidates,
+            key=lambda position: abs(onset - midi_notes[position].start_time)
+        )
         
-        for midi_note in candidates:
+        best_match = None
+        best_position = -1
+        for position in ordered:
+            midi_note = midi_notes[position]
+            if best_match is not None:
+                time_diff = abs(onset - midi_note.start_time)
+                timing_ceiling = max(0.0, 1.0 - (time_diff / tolerance))
+                if best_match.confidence > 0.4 * timing_ceiling + 0.4 + 0.2:
+                    break
+            
             # Calculate comprehensive match score
-            match = self._calculate_match_score(xml_note, midi_note)
-            scored_candidates.append(match)
+            match = self._calculate_match_score(xml_note, xml_pitch, midi_note)
+            
+            # Highest confidence wins; ties go to the earliest candidate
+            if (best_match is None or match.confidence > best_match.confidence or
+                    (match.confidence == best_match.confidence and position < best_position)):
+                best_match = match
+                best_position = position
         
-        # Return the highest confidence match
-        best_match = max(scored_candidates, key=lambda x: x.confidence)
-        return best_match
+        return best_match, best_position
     
     def _calculate_match_score(
         self, 
         xml_note: MusicXMLNote, 
+        xml_pitch: int,
         midi_note: MIDINote
     ) -> NoteMatch:
         """Calculate comprehensive confidence score for a potential match"""
@@ -276,12 +383,12 @@ class MIDIMatcher:
         timing_score = max(0.0, 1.0 - (time_diff / self.tolerance_seconds))
         
         # Pitch score (1.0 for exact, partial for octave errors)
-        pitch_match = xml_note.pitch_midi == midi_note.pitch
+        pitch_match = xml_pitch == midi_note.pitch
         if pitch_match:
             pitch_score = 1.0
         else:
             # Penalize octave errors but don't eliminate completely
-            pitch_diff = abs(xml_note.pitch_midi - midi_note.pitch)
+            pitch_diff = abs(xml_pitch - midi_note.pitch)
             if pitch_diff % 12 == 0:  # Same note, different octave
                 pitch_score = 0.7
             else:
@@ -324,16 +431,9 @@ class MIDIMatcher:
         """Calculate context-based scoring factors"""
         score = 0.5  # Base score
         
-        # Instrument context (if available)
-        if hasattr(xml_note, 'part_id') and hasattr(midi_note, 'instrument'):
-            # Simple instrument name matching
-            xml_instrument = xml_note.part_id.lower()
-            midi_instrument = midi_note.instrument.lower()
-            
-            # Basic instrument family matching
-            if any(inst in xml_instrument and inst in midi_instrument 
-                   for inst in ['flute', 'violin', 'piano', 'cello']):
-                score += 0.3
+        # Instrument context: basic instrument family matching
+        if _instrument_families(xml_note.part_id) & _instrument_families(midi_note.instrument):
+            score += 0.3
         
         # Velocity context (reasonable range)
         if 40 <= midi_note.velocity <= 100:  # Typical performance range
@@ -392,52 +492,64 @@ class MIDIMatcher:
     
     def save_matches_to_json(self, matches: List[NoteMatch], output_path: Path):
         """Save match results to JSON file for analysis and debugging"""
-        match_data = {
+        header = {
             'matcher_config': {
                 'tolerance_seconds': self.tolerance_seconds,
                 'strict_pitch': self.strict_pitch
             },
-            'statistics': self.get_match_statistics(matches),
-            'matches': []
+            'statistics': self.get_match_statistics(matches)
         }
         
-        for match in matches:
-            match_dict = {
-                'xml_note': {
-                    'pitch': match.xml_note.pitch,
-                    'onset_time': match.xml_note.onset_time,
-                    'measure': match.xml_note.measure_number,
-                    'beat_position': match.xml_note.beat_position,
-                    'part_id': match.xml_note.part_id
-                },
-                'midi_note': {
-                    'pitch': match.midi_note.pitch,
-                    'pitch_name': match.midi_note.pitch_name,
-                    'start_time': match.midi_note.start_time,
-                    'velocity': match.midi_note.velocity,
-                    'instrument': match.midi_note.instrument,
-                    'track_name': match.midi_note.track_name
-                },
-                'scoring': {
-                    'confidence': match.confidence,
-                    'time_difference': match.time_difference,
-                    'timing_score': match.timing_score,
-                    'context_score': match.context_score,
-                    'match_type': match.match_type,
-                    'pitch_match': match.pitch_match
-                }
-            }
-            match_data['matches'].append(match_dict)
-        
-        # Save to JSON
+        # Stream matches one record at a time rather than materializing the
+        # full document; output is identical to json.dump(..., indent=2)
         with open(output_path, 'w') as f:
-            json.dump(match_data, f, indent=2)
+            f.write('{')
+            for key, value in header.items():
+                f.write(f'\n  {json.dumps(key)}: ')
+                f.write(json.dumps(value, indent=2).replace('\n', '\n  '))
+                f.write(',')
+            f.write('\n  "matches": [')
+            separator = '\n    '
+            for match in matches:
+                f.write(separator)
+                f.write(json.dumps(self._match_to_dict(match), indent=2).replace('\n', '\n    '))
+                separator = ',\n    '
+            f.write('\n  ]\n}' if matches else ']\n}')
         
         print(f"💾 Match results saved to: {output_path}")
         return output_path
     
+    def _match_to_dict(self, match: NoteMatch) -> Dict:
+        """Convert a single match into its JSON record"""
+        return {
+            'xml_note': {
+                'pitch': match.xml_note.pitch,
+                'onset_time': match.xml_note.onset_time,
+                'measure': match.xml_note.measure_number,
+                'beat_position': match.xml_note.beat_position,
+                'part_id': match.xml_note.part_id
+            },
+            'midi_note': {
+                'pitch': match.midi_note.pitch,
+                'pitch_name': match.midi_note.pitch_name,
+                'start_time': match.midi_note.start_time,
+                'velocity': match.midi_note.velocity,
+                'instrument': match.midi_note.instrument,
+                'track_name': match.midi_note.track_name
+            },
+            'scoring': {
+                'confidence': match.confidence,
+                'time_difference': match.time_difference,
+                'timing_score': match.timing_score,
+                'context_score': match.context_score,
+                'match_type': match.match_type,
+                'pitch_match': match.pitch_match
+            }
+        }
+    
     def reset_matching_state(self):
         """Reset matcher state for fresh matching session"""
+        self._midi_used[:] = bytes(len(self._midi_used))
         self.matched_midi_notes.clear()
         self.matched_xml_notes.clear()
         print("🔄 Matcher state reset")
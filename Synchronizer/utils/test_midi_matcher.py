@@ -217,6 +217,86 @@ def test_statistics_and_output():
         return False
 
 
+def test_prepared_reuse_and_reset():
+    """Test reusing prepared MIDI notes across calls and resetting used notes"""
+    print("\n🧪 TEST 5: Prepared Reuse and Reset")
+    print("=" * 40)
+    
+    def midi_note(pitch, start_time, note_id):
+        return MIDINote(
+            pitch=pitch, velocity=80, start_time=start_time, end_time=start_time + 0.5,
+            duration=0.5, channel=0, instrument="Flûte", track_index=1,
+            track_name="Flûte", note_id=note_id
+        )
+    
+    midi_notes = [midi_note(59, 6.0, "n0"), midi_note(69, 7.5, "n1")]
+    xml_notes = create_test_xml_notes()[:2]  # B3 @ 6.0s, A4 @ 7.5s
+    
+    matcher = MIDIMatcher(tolerance_ms=100.0, strict_pitch=True)
+    matcher.prepare(midi_notes)
+    
+    # Omitting midi_notes reuses the prepared index; used notes stay excluded
+    first = matcher.match_notes_with_tolerance(xml_notes)
+    assert [m.midi_note.note_id for m in first] == ["n0", "n1"]
+    assert matcher.match_notes_with_tolerance(xml_notes) == []
+    
+    # Re-preparing a grown list picks up the new note but keeps n1 excluded
+    midi_notes.append(midi_note(69, 7.52, "n2"))
+    matcher.prepare(midi_notes)
+    third = matcher.match_notes_with_tolerance(xml_notes[1:])
+    assert [m.midi_note.note_id for m in third] == ["n2"]
+    
+    # Passing the list again re-prepares it and still honours used notes
+    assert matcher.match_notes_with_tolerance(xml_notes, midi_notes) == []
+    
+    # Resetting frees every MIDI note for a fresh session
+    matcher.reset_matching_state()
+    fourth = matcher.match_notes_with_tolerance(xml_notes)
+    assert [m.midi_note.note_id for m in fourth] == ["n0", "n1"]
+    
+    print("✅ Prepared notes reused, re-prepared and reset as expected")
+    return True
+
+
+def test_duplicate_note_ids():
+    """Test that MIDI notes sharing a note_id are used up together"""
+    print("\n🧪 TEST 6: Duplicate Note IDs")
+    print("=" * 40)
+    
+    # master-timing note_ids are midi_{track}_{start:.3f}_{pitch}, so two notes
+    # on one track and pitch within the same millisecond share an id
+    midi_notes = [
+        MIDINote(
+            pitch=69, velocity=80, start_time=start_time, end_time=start_time + 0.5,
+            duration=0.5, channel=0, instrument="Flûte", track_index=1,
+            track_name="Flûte", note_id="midi_1_7.500_69"
+        )
+        for start_time in (7.5, 7.5004)
+    ]
+    xml_notes = [
+        MusicXMLNote(
+            pitch="A4", duration=480, beat_position=1.0, measure_number=5,
+            part_id="Flûte", voice=1, tie_type=None, tied_group_id=None,
+            onset_time=onset_time
+        )
+        for onset_time in (7.5, 7.5005)
+    ]
+    
+    matcher = MIDIMatcher(tolerance_ms=100.0, strict_pitch=True)
+    
+    # Matching one note uses up its duplicate within the same call...
+    matches = matcher.match_notes_with_tolerance(xml_notes, midi_notes)
+    assert len(matches) == 1
+    
+    # ...and across calls and re-prepares, until the state is reset
+    assert matcher.match_notes_with_tolerance(xml_notes[1:], midi_notes) == []
+    matcher.reset_matching_state()
+    assert len(matcher.match_notes_with_tolerance(xml_notes, midi_notes)) == 1
+    
+    print("✅ Duplicate note_ids are used up together")
+    return True
+
+
 def main():
     """Run all MIDI matcher tests"""
     print("🎯 MIDI MATCHER COMPREHENSIVE TEST SUITE")
@@ -229,6 +309,8 @@ def main():
     test_results.append(("Tolerance Matching", test_tolerance_matching()))
     test_results.append(("Confidence Scoring", test_confidence_scoring()))
     test_results.append(("Statistics & Output", test_statistics_and_output()))
+    test_results.append(("Prepared Reuse & Reset", test_prepared_reuse_and_reset()))
+    test_results.append(("Duplicate Note IDs", test_duplicate_note_ids()))
     
     # Summary
     print("\n📋 TEST RESULTS SUMMARY")
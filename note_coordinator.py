@@ -14,18 +14,56 @@ Key Features:
 - Comprehensive metadata generation
 """
 
-import xml.etree.ElementTree as ET
+try:
+    from lxml import etree as ET  # libxml2-backed, faster on attribute-heavy MusicXML
+except ImportError:
+    import xml.etree.ElementTree as ET
+try:
+    import orjson  # Rust-backed encoder with native dataclass support
+except ImportError:
+    orjson = None
 import mido
 import json
+import re
 import sys
 import os
 from pathlib import Path
 from typing import List, Dict, Tuple, Optional
-from dataclasses import dataclass, asdict
+from dataclasses import dataclass, fields, is_dataclass
+from bisect import bisect_right
+from collections import Counter, defaultdict, deque
 import uuid
 from datetime import datetime
+from json.encoder import encode_basestring_ascii
 
-@dataclass
+# Pitch class of each natural step, for canonical MIDI pitch keys
+PITCH_CLASSES = {'C': 0, 'D': 2, 'E': 4, 'F': 5, 'G': 7, 'A': 9, 'B': 11}
+
+# Note name of every MIDI pitch number (sharps spelling), e.g. 69 -> 'A4'
+PITCH_CLASS_NAMES = ('C', 'C#', 'D', 'D#', 'E', 'F', 'F#', 'G', 'G#', 'A', 'A#', 'B')
+MIDI_NOTE_NAMES = tuple(f"{PITCH_CLASS_NAMES[n % 12]}{n // 12 - 1}" for n in range(128))
+
+# Suffixes appended to each note's shared filename stem in the MIDI manifest
+MIDI_FILE_SUFFIX = ".mid"
+AUDIO_FILE_SUFFIX = ".wav"
+KEYFRAMES_FILE_SUFFIX = "_keyframes.json"
+
+def _note_name_to_midi(note_name: str) -> Optional[int]:
+    """Parse a note name to its MIDI pitch number"""
+    base = PITCH_CLASSES.get(note_name[:1])
+    if base is None:
+        return None
+    
+    accidentals = note_name[1:].rstrip('-0123456789')
+    try:
+        octave = int(note_name[1 + len(accidentals):])
+    except ValueError:
+        return None
+    
+    alter = accidentals.count('#') - accidentals.count('b')
+    return (octave + 1) * 12 + base + alter
+
+@dataclass(slots=True)
 class XMLNote:
     """Note data from MusicXML"""
     part_id: str
@@ -39,7 +77,7 @@ class XMLNote:
     note_name: str
     staff_index: int
 
-@dataclass
+@dataclass(slots=True)
 class MIDINote:
     """Note data from MIDI"""
     track_index: int
@@ -55,7 +93,7 @@ class MIDINote:
     duration_ticks: int
     channel: int
 
-@dataclass
+@dataclass(slots=True)
 class SVGNote:
     """Note data calculated for SVG positioning"""
     svg_x: int
@@ -64,7 +102,7 @@ class SVGNote:
     notehead_code: int
     unicode_char: str
 
-@dataclass
+@dataclass(slots=True)
 class UniversalNote:
     """Unified note with all format data and relationships"""
     universal_id: str
@@ -75,6 +113,46 @@ class UniversalNote:
     match_method: str
     timing_priority: str  # 'xml' or 'midi'
 
+def write_json(file_path: str, data):
+    """Write data as indented JSON, serializing dataclasses without a deep copy when orjson is available"""
+    with open(file_path, 'wb') as f:
+        f.write(_encode_json(data))
+
+def write_json_records(file_path: str, records):
+    """Stream records as an indented JSON array, encoding one record at a time"""
+    with open(file_path, 'wb') as f:
+        f.write(b'[')
+        separator = b'\n  '
+        for record in records:
+            f.write(separator)
+            f.write(_encode_json(record).replace(b'\n', b'\n  '))
+            separator = b',\n  '
+        f.write(b'\n]' if separator != b'\n  ' else b']')
+
+# Runs of non-ASCII characters, which only occur inside encoded JSON strings
+NON_ASCII_RUN = re.compile('[^\x00-\x7f]+')
+
+def _encode_json(data) -> bytes:
+    """Encode data as indented JSON bytes with orjson, or the stdlib json fallback"""
+    if orjson is not None:
+        encoded = orjson.dumps(data, default=str, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+        if encoded.isascii():
+            return encoded
+        # Escape to \uXXXX like the stdlib default so output bytes don't depend on orjson
+        return NON_ASCII_RUN.sub(
+            lambda match: encode_basestring_ascii(match.group())[1:-1],
+            encoded.decode()
+        ).encode()
+    return json.dumps(data, indent=2, default=_json_default).encode()
+
+def _json_default(obj):
+    """Fallback encoder for the stdlib json path"""
+    if is_dataclass(obj):
+        # Shallow field dict; nested dataclasses come back through this hook,
+        # avoiding asdict()'s recursive deepcopy of the whole note tree
+        return {field.name: getattr(obj, field.name) for field in fields(obj)}
+    return str(obj)
+
 class NoteCoordinator:
     """Main coordinator for note matching across formats"""
     
@@ -89,47 +167,70 @@ class NoteCoordinator:
         """Load and parse notes from MusicXML"""
         print(f"📄 Loading XML notes from: {musicxml_file}")
         
-        tree = ET.parse(musicxml_file)
-        root = tree.getroot()
-        
-        # Extract scaling for coordinate conversion
-        scaling = root.find('defaults/scaling')
-        if scaling is not None:
-            tenths = float(scaling.find('tenths').text)
-            mm = float(scaling.find('millimeters').text)
-            scaling_factor = mm / tenths
-        else:
-            scaling_factor = 0.15
-        
         notes = []
-        parts = []
-        
-        # Get part list for staff assignment
-        part_list = root.find('part-list')
-        if part_list is not None:
-            for score_part in part_list.findall('score-part'):
-                parts.append(score_part.get('id'))
-        
-        for part in root.findall('part'):
-            part_id = part.get('id')
-            cumulative_x = 0
+        part_index = {}
+        root = None
+        current_part = None
+        part_id = None
+        staff_index = 0
+        score_part_count = 0
+        in_part_list = False
+        cumulative_x = 0
+        depth = 0  # Depth of the element being opened/closed (root = 0)
+        
+        # Stream the score: each measure is processed once its end tag has been
+        # read and then discarded, so only one measure's subtree stays in memory.
+        # Only partwise structure counts: <part-list>/<part> directly under the
+        # root and <score-part>/<measure> directly under those, so other layouts
+        # (e.g. score-timewise) yield no notes rather than a misparse
+        for event, elem in ET.iterparse(musicxml_file, events=('start', 'end')):
+            if event == 'start':
+                if root is None:
+                    root = elem
+                elif depth == 1:
+                    if elem.tag == 'part':
+                        current_part = elem
+                        part_id = elem.get('id')
+                        staff_index = part_index.get(part_id, 0)
+                        cumulative_x = 0
+                    elif elem.tag == 'part-list':
+                        in_part_list = True
+                depth += 1
+                continue
+            
+            depth -= 1
             
-            for measure in part.findall('measure'):
-                measure_num = int(measure.get('number'))
-                measure_width = float(measure.get('width', 0))
+            if elem.tag == 'score-part' and depth == 2 and in_part_list:
+                # Get part list for staff assignment (first occurrence wins)
+                part_index.setdefault(elem.get('id'), score_part_count)
+                score_part_count += 1
                 
-                for note in measure.findall('note'):
-                    if note.find('rest') is not None:
-                        continue
-                        
-                    pitch = note.find('pitch')
-                    if pitch is None:
+            elif elem.tag == 'measure' and depth == 2 and current_part is not None:
+                measure_num = int(elem.get('number'))
+                measure_width = float(elem.get('width', 0))
+                
+                for note in elem.findall('note'):
+                    # Single walk over the note's children instead of one
+                    # find() scan per child element of interest
+                    pitch = None
+                    note_type = None
+                    is_rest = False
+                    for child in note:
+                        tag = child.tag
+                        if tag == 'rest':
+                            is_rest = True
+                            break
+                        elif tag == 'pitch' and pitch is None:
+                            pitch = child
+                        elif tag == 'type' and note_type is None:
+                            note_type = child
+                    
+                    if is_rest or pitch is None:
                         continue
                         
                     step = pitch.find('step').text
                     octave = int(pitch.find('octave').text)
                     
-                    note_type = note.find('type')
                     duration = note_type.text if note_type is not None else 'quarter'
                     
                     xml_x = float(note.get('default-x', 0))
@@ -146,12 +247,23 @@ class NoteCoordinator:
                         xml_y=xml_y,
                         absolute_x=absolute_x,
                         note_name=f"{step}{octave}",
-                        staff_index=parts.index(part_id) if part_id in parts else 0
+                        staff_index=staff_index
                     )
                     
                     notes.append(xml_note)
                 
                 cumulative_x += measure_width
+                
+                # Release the consumed measure
+                elem.clear()
+                current_part.remove(elem)
+                
+            elif depth == 1:
+                if elem.tag == 'part':
+                    root.remove(elem)
+                    current_part = None
+                elif elem.tag == 'part-list':
+                    in_part_list = False
         
         self.xml_notes = notes
         print(f"   ✅ Loaded {len(notes)} XML notes from {len(set(n.part_id for n in notes))} parts")
@@ -169,6 +281,9 @@ class NoteCoordinator:
             active_notes = {}
             current_time = 0
             
+            # Resolve the track's tempo map once instead of per note
+            tempo_ticks, tempo_segments = self.build_tempo_map(track, mid.ticks_per_beat)
+            
             for msg in track:
                 current_time += msg.time
                 
@@ -181,23 +296,21 @@ class NoteCoordinator:
                         duration = current_time - start_time
                         
                         # Convert ticks to seconds using tempo map
-                        # Extract tempo from MIDI or default to 120 BPM
-                        tempo_bpm = 120.0  # Default
-                        for temp_msg in track:
-                            if temp_msg.type == 'set_tempo':
-                                tempo_bpm = 60000000 / temp_msg.tempo
-                                break
-                        
-                        seconds_per_beat = 60.0 / tempo_bpm
-                        start_seconds = start_time / mid.ticks_per_beat * seconds_per_beat
-                        end_seconds = current_time / mid.ticks_per_beat * seconds_per_beat
-                        duration_seconds = duration / mid.ticks_per_beat * seconds_per_beat
+                        start_segment = bisect_right(tempo_ticks, start_time) - 1
+                        end_segment = bisect_right(tempo_ticks, current_time) - 1
+                        start_seconds = self.ticks_to_seconds(start_time, tempo_segments[start_segment], mid.ticks_per_beat)
+                        end_seconds = self.ticks_to_seconds(current_time, tempo_segments[end_segment], mid.ticks_per_beat)
+                        if start_segment == end_segment:
+                            seconds_per_beat = tempo_segments[start_segment][2]
+                            duration_seconds = duration / mid.ticks_per_beat * seconds_per_beat
+                        else:
+                            duration_seconds = end_seconds - start_seconds
                         
                         midi_note = MIDINote(
                             track_index=track_idx,
                             track_name=track_name,
                             pitch_midi=msg.note,
-                            pitch_name=self.midi_to_note_name(msg.note),
+                            pitch_name=MIDI_NOTE_NAMES[msg.note],
                             velocity=velocity,
                             start_time_seconds=start_seconds,
                             end_time_seconds=end_seconds,
@@ -214,12 +327,44 @@ class NoteCoordinator:
         self.midi_notes = notes
         print(f"   ✅ Loaded {len(notes)} MIDI notes from {len(set(n.track_name for n in notes))} tracks")
         
+    def build_tempo_map(self, track, ticks_per_beat: int) -> Tuple[List[int], List[Tuple[int, float, float]]]:
+        """
+        Build a track's tempo map as (start_tick, start_seconds, seconds_per_beat)
+        segments, plus the segment start ticks for bisect lookups.
+        
+        The track's first tempo applies from its start (default 120 BPM);
+        later set_tempo messages start new segments.
+        """
+        tempo_changes = []
+        current_time = 0
+        for msg in track:
+            current_time += msg.time
+            if msg.type == 'set_tempo':
+                tempo_changes.append((current_time, msg.tempo))
+        
+        tempo_bpm = 60000000 / tempo_changes[0][1] if tempo_changes else 120.0
+        segments = [(0, 0.0, 60.0 / tempo_bpm)]
+        
+        for change_tick, tempo in tempo_changes[1:]:
+            seconds_per_beat = 60.0 / (60000000 / tempo)
+            if change_tick == segments[-1][0]:
+                segments[-1] = (change_tick, segments[-1][1], seconds_per_beat)
+            else:
+                start_seconds = self.ticks_to_seconds(change_tick, segments[-1], ticks_per_beat)
+                segments.append((change_tick, start_seconds, seconds_per_beat))
+        
+        return [segment[0] for segment in segments], segments
+    
+    def ticks_to_seconds(self, ticks: int, segment: Tuple[int, float, float], ticks_per_beat: int) -> float:
+        """Convert absolute ticks to seconds within a tempo map segment"""
+        start_tick, start_seconds, seconds_per_beat = segment
+        return start_seconds + (ticks - start_tick) / ticks_per_beat * seconds_per_beat
+    
     def midi_to_note_name(self, note_number: int) -> str:
         """Convert MIDI note number to note name"""
-        notes = ['C', 'C#', 'D', 'D#', 'E', 'F', 'F#', 'G', 'G#', 'A', 'A#', 'B']
-        octave = note_number // 12 - 1
-        note = notes[note_number % 12]
-        return f"{note}{octave}"
+        if 0 <= note_number < 128:
+            return MIDI_NOTE_NAMES[note_number]
+        return f"{PITCH_CLASS_NAMES[note_number % 12]}{note_number // 12 - 1}"
         
     def calculate_svg_coordinates(self):
         """Calculate SVG coordinates for XML notes using universal transformation"""
@@ -233,33 +378,36 @@ class NoteCoordinator:
         STAFF_BASE_Y_START = 1037  # First staff base Y
         STAFF_SEPARATION = 380     # Separation between staves
         
+        # Notehead type (universal for all durations): hollow for whole/half notes
+        HOLLOW_NOTEHEAD = (70, '&#70;')
+        FULL_NOTEHEAD = (102, '&#102;')
+        HOLLOW_DURATIONS = frozenset(('whole', 'half'))
+        
         svg_notes = []
+        append = svg_notes.append
         
         for xml_note in self.xml_notes:
+            staff_index = xml_note.staff_index
+            
             # X coordinate transformation (universal)
             svg_x = int(xml_note.absolute_x * X_SCALE + X_OFFSET)
             
-            # Y coordinate transformation - universal staff positioning
-            base_y = STAFF_BASE_Y_START + (xml_note.staff_index * STAFF_SEPARATION)
-            
-            # Universal Y offset calculation based on XML Y value
-            # This maps any XML Y coordinate to appropriate staff position
-            y_offset = xml_note.xml_y * 1.2  # Universal scaling factor for Y positioning
-            svg_y = int(base_y + y_offset)
+            # Y coordinate transformation - universal staff positioning, with the
+            # XML Y value scaled by the universal factor 1.2 onto the staff
+            base_y = STAFF_BASE_Y_START + (staff_index * STAFF_SEPARATION)
+            svg_y = int(base_y + xml_note.xml_y * 1.2)
             
-            # Notehead type (universal for all durations)
-            notehead_code = 70 if xml_note.duration in ['whole', 'half'] else 102
-            unicode_char = '&#70;' if xml_note.duration in ['whole', 'half'] else '&#102;'
+            notehead_code, unicode_char = (
+                HOLLOW_NOTEHEAD if xml_note.duration in HOLLOW_DURATIONS else FULL_NOTEHEAD
+            )
             
-            svg_note = SVGNote(
+            append(SVGNote(
                 svg_x=svg_x,
                 svg_y=svg_y,
-                staff_index=xml_note.staff_index,
+                staff_index=staff_index,
                 notehead_code=notehead_code,
                 unicode_char=unicode_char
-            )
-            
-            svg_notes.append(svg_note)
+            ))
         
         self.svg_notes = svg_notes
         print(f"   ✅ Calculated {len(svg_notes)} SVG coordinates")
@@ -269,55 +417,61 @@ class NoteCoordinator:
         print(f"🔗 Matching XML to MIDI notes")
         
         matches = []
-        used_midi_indices = set()
+        used_midi = bytearray(len(self.midi_notes))
+        
+        # Hash-index MIDI note indices (in MIDI order) so each XML note only
+        # touches notes that can actually match:
+        # - by spelled pitch name, for exact matches
+        # - by pitch name and track, for the track-to-part confidence boost
+        # - by MIDI pitch number, shared by every enharmonic spelling
+        midi_by_name = defaultdict(deque)
+        midi_by_name_track = defaultdict(deque)
+        midi_by_pitch = defaultdict(deque)
+        for i, midi_note in enumerate(self.midi_notes):
+            midi_by_name[midi_note.pitch_name].append(i)
+            midi_by_name_track[(midi_note.pitch_name, midi_note.track_index)].append(i)
+            midi_by_pitch[midi_note.pitch_midi].append(i)
+        
+        def first_unused(queue):
+            """Earliest unused MIDI index in queue, dropping used ones from its head"""
+            while queue and used_midi[queue[0]]:
+                queue.popleft()
+            return queue[0] if queue else -1
         
         for xml_note in self.xml_notes:
             best_match = None
             best_confidence = 0.0
             best_method = "no_match"
-            best_midi_idx = -1
             
             xml_pitch = f"{xml_note.step}{xml_note.octave}"
             
-            # Try exact pitch match first
-            for i, midi_note in enumerate(self.midi_notes):
-                if i in used_midi_indices:
-                    continue
-                    
-                if midi_note.pitch_name == xml_pitch:
-                    confidence = 0.9
-                    method = "exact_pitch"
-                    
-                    # Boost confidence using universal track-to-part matching
-                    # Match MIDI track index to XML part staff index
-                    if midi_note.track_index == xml_note.staff_index + 1:  # +1 because track 0 is usually tempo/meta
-                        confidence += 0.1
-                    
-                    if confidence > best_confidence:
-                        best_match = midi_note
-                        best_confidence = confidence
-                        best_method = method
-                        best_midi_idx = i
+            # Try exact pitch match first, preferring the universal track-to-part
+            # match: MIDI track index == XML staff index + 1 (track 0 is usually tempo/meta)
+            best_midi_idx = first_unused(midi_by_name_track[(xml_pitch, xml_note.staff_index + 1)])
+            if best_midi_idx >= 0:
+                best_confidence = 0.9 + 0.1  # exact pitch plus track boost
+                best_method = "exact_pitch"
+            else:
+                best_midi_idx = first_unused(midi_by_name[xml_pitch])
+                if best_midi_idx >= 0:
+                    best_confidence = 0.9
+                    best_method = "exact_pitch"
             
-            # If no exact match, try enharmonic equivalents
-            if best_confidence < 0.5:
-                enharmonic_pitches = self.get_enharmonic_equivalents(xml_pitch)
-                for i, midi_note in enumerate(self.midi_notes):
-                    if i in used_midi_indices:
-                        continue
-                        
-                    if midi_note.pitch_name in enharmonic_pitches:
-                        confidence = 0.7
-                        method = "enharmonic"
-                        
-                        if confidence > best_confidence:
-                            best_match = midi_note
-                            best_confidence = confidence
-                            best_method = method
-                            best_midi_idx = i
+            # If no exact match, any remaining note of the same pitch is an
+            # enharmonic equivalent (earliest MIDI note wins). This only fires
+            # for XML notes spelled with an accidental (e.g. Db4 against C#4),
+            # which callers can append to xml_notes themselves; load_xml_notes
+            # does not read <alter> yet, so its names are always naturals and
+            # their pitch bucket holds nothing the exact lookup left unused
+            if best_midi_idx < 0:
+                best_midi_idx = first_unused(midi_by_pitch[_note_name_to_midi(xml_pitch)])
+                if best_midi_idx >= 0:
+                    best_confidence = 0.7
+                    best_method = "enharmonic"
             
             if best_midi_idx >= 0:
-                used_midi_indices.add(best_midi_idx)
+                used_midi[best_midi_idx] = 1
+                best_match = self.midi_notes[best_midi_idx]
             
             matches.append((xml_note, best_match, best_confidence, best_method))
         
@@ -327,7 +481,12 @@ class NoteCoordinator:
         return matches
         
     def get_enharmonic_equivalents(self, note_name: str) -> List[str]:
-        """Get enharmonic equivalent note names"""
+        """
+        Get enharmonic equivalent note names.
+        
+        match_xml_to_midi no longer calls this (it groups MIDI notes by
+        pitch number instead); kept for API compatibility.
+        """
         enharmonic_map = {
             'C#': ['Db'], 'Db': ['C#'],
             'D#': ['Eb'], 'Eb': ['D#'],
@@ -351,9 +510,12 @@ class NoteCoordinator:
         xml_midi_matches = self.match_xml_to_midi()
         universal_notes = []
         
+        # Draw random bytes for every universal ID in one syscall
+        id_bytes = os.urandom(16 * len(xml_midi_matches))
+        
         for i, (xml_note, midi_note, confidence, method) in enumerate(xml_midi_matches):
-            # Generate universal ID
-            universal_id = str(uuid.uuid4())
+            # Generate universal ID (random version 4 UUID, as uuid.uuid4())
+            universal_id = str(uuid.UUID(bytes=id_bytes[i * 16:(i + 1) * 16], version=4))
             
             # Get corresponding SVG data
             svg_note = self.svg_notes[i] if i < len(self.svg_notes) else None
@@ -378,54 +540,62 @@ class NoteCoordinator:
         
     def generate_pipeline_manifests(self):
         """Generate manifests for pipeline execution"""
-        manifests = {}
+        return {
+            'midi_pipeline': list(self.iter_midi_manifest()),
+            'svg_pipeline': list(self.iter_svg_manifest())
+        }
         
-        # MIDI pipeline manifest
-        midi_manifest = []
+    def iter_midi_manifest(self):
+        """Yield MIDI pipeline manifest records one note at a time"""
         for i, note in enumerate(self.universal_notes):
-            if note.midi_data:
-                midi_manifest.append({
+            midi_data = note.midi_data
+            if midi_data:
+                note_name = note.xml_data.note_name
+                track_name = midi_data.track_name
+                velocity = midi_data.velocity
+                
+                # Shared stem for the .mid / .wav / keyframes filenames
+                file_stem = f"note_{i:03d}_{track_name}_{note_name}_vel{velocity}"
+                
+                yield {
                     'universal_id': note.universal_id,
                     'midi_sequence_id': i,
-                    'original_filename': f"note_{i:03d}_{note.midi_data.track_name}_{note.xml_data.note_name}_vel{note.midi_data.velocity}.mid",
-                    'audio_filename': f"note_{i:03d}_{note.midi_data.track_name}_{note.xml_data.note_name}_vel{note.midi_data.velocity}.wav",
-                    'keyframes_filename': f"note_{i:03d}_{note.midi_data.track_name}_{note.xml_data.note_name}_vel{note.midi_data.velocity}_keyframes.json",
-                    'track_name': note.midi_data.track_name,
-                    'pitch': note.xml_data.note_name,
+                    'original_filename': file_stem + MIDI_FILE_SUFFIX,
+                    'audio_filename': file_stem + AUDIO_FILE_SUFFIX,
+                    'keyframes_filename': file_stem + KEYFRAMES_FILE_SUFFIX,
+                    'track_name': track_name,
+                    'pitch': note_name,
                     'timing_data': {
-                        'start_seconds': note.midi_data.start_time_seconds,
-                        'duration_seconds': note.midi_data.duration_seconds,
-                        'velocity': note.midi_data.velocity
+                        'start_seconds': midi_data.start_time_seconds,
+                        'duration_seconds': midi_data.duration_seconds,
+                        'velocity': velocity
                     }
-                })
-        
-        manifests['midi_pipeline'] = midi_manifest
+                }
         
-        # SVG pipeline manifest
-        svg_manifest = []
+    def iter_svg_manifest(self):
+        """Yield SVG pipeline manifest records one note at a time"""
         for note in self.universal_notes:
-            svg_manifest.append({
+            xml_data = note.xml_data
+            svg_data = note.svg_data
+            
+            yield {
                 'universal_id': note.universal_id,
-                'svg_filename': f"notehead_{note.universal_id[:8]}_{note.xml_data.part_id}_{note.xml_data.note_name}_M{note.xml_data.measure}.svg",
+                'svg_filename': f"notehead_{note.universal_id[:8]}_{xml_data.part_id}_{xml_data.note_name}_M{xml_data.measure}.svg",
                 'coordinates': {
-                    'svg_x': note.svg_data.svg_x,
-                    'svg_y': note.svg_data.svg_y,
-                    'staff_index': note.svg_data.staff_index
+                    'svg_x': svg_data.svg_x,
+                    'svg_y': svg_data.svg_y,
+                    'staff_index': svg_data.staff_index
                 },
                 'visual_data': {
-                    'notehead_code': note.svg_data.notehead_code,
-                    'unicode_char': note.svg_data.unicode_char,
-                    'duration': note.xml_data.duration
+                    'notehead_code': svg_data.notehead_code,
+                    'unicode_char': svg_data.unicode_char,
+                    'duration': xml_data.duration
                 },
                 'instrument_info': {
-                    'part_id': note.xml_data.part_id,
-                    'measure': note.xml_data.measure
+                    'part_id': xml_data.part_id,
+                    'measure': xml_data.measure
                 }
-            })
-        
-        manifests['svg_pipeline'] = svg_manifest
-        
-        return manifests
+            }
         
     def generate_comprehensive_metadata(self, musicxml_file: str, midi_file: str):
         """Generate comprehensive metadata about the coordination"""
@@ -442,76 +612,113 @@ class NoteCoordinator:
                 'midi_notes_found': len(self.midi_notes),
                 'svg_coordinates_calculated': len(self.svg_notes)
             },
-            'matching_statistics': {
-                'exact_pitch_matches': len([n for n in self.universal_notes if n.match_method == 'exact_pitch']),
-                'enharmonic_matches': len([n for n in self.universal_notes if n.match_method == 'enharmonic']),
-                'unmatched_notes': len([n for n in self.universal_notes if n.match_method == 'no_match']),
-                'high_confidence_matches': len([n for n in self.universal_notes if n.match_confidence >= 0.8]),
-                'average_confidence': sum(n.match_confidence for n in self.universal_notes) / len(self.universal_notes) if self.universal_notes else 0
-            },
+            'matching_statistics': self._matching_statistics(),
             'instrument_breakdown': self.get_instrument_breakdown(),
             'timing_analysis': self.get_timing_analysis(),
             'coordinate_ranges': self.get_coordinate_ranges()
         }
         
+    def _matching_statistics(self):
+        """Count match methods and confidences in a single pass"""
+        method_counts = Counter()
+        high_confidence_matches = 0
+        confidences = []
+        for note in self.universal_notes:
+            method_counts[note.match_method] += 1
+            confidence = note.match_confidence
+            confidences.append(confidence)
+            if confidence >= 0.8:
+                high_confidence_matches += 1
+        
+        return {
+            'exact_pitch_matches': method_counts['exact_pitch'],
+            'enharmonic_matches': method_counts['enharmonic'],
+            'unmatched_notes': method_counts['no_match'],
+            'high_confidence_matches': high_confidence_matches,
+            'average_confidence': sum(confidences) / len(confidences) if confidences else 0
+        }
+        
     def get_instrument_breakdown(self):
         """Get breakdown by instrument/part"""
         breakdown = {}
+        part_pitches = {}
         for note in self.universal_notes:
-            part_id = note.xml_data.part_id
-            if part_id not in breakdown:
-                breakdown[part_id] = {
+            xml_data = note.xml_data
+            part_id = xml_data.part_id
+            
+            part_data = breakdown.get(part_id)
+            if part_data is None:
+                part_data = breakdown[part_id] = {
                     'total_notes': 0,
                     'matched_to_midi': 0,
-                    'pitch_range': [],
                     'measures': set()
                 }
+                part_pitches[part_id] = set()
             
-            breakdown[part_id]['total_notes'] += 1
+            part_data['total_notes'] += 1
             if note.midi_data:
-                breakdown[part_id]['matched_to_midi'] += 1
-            breakdown[part_id]['pitch_range'].append(note.xml_data.note_name)
-            breakdown[part_id]['measures'].add(note.xml_data.measure)
+                part_data['matched_to_midi'] += 1
+            part_pitches[part_id].add(xml_data.note_name)
+            part_data['measures'].add(xml_data.measure)
         
         # Convert sets to lists for JSON serialization
-        for part_data in breakdown.values():
-            part_data['measures'] = sorted(list(part_data['measures']))
-            part_data['unique_pitches'] = sorted(list(set(part_data['pitch_range'])))
-            del part_data['pitch_range']
+        for part_id, part_data in breakdown.items():
+            part_data['measures'] = sorted(part_data['measures'])
+            part_data['unique_pitches'] = sorted(part_pitches[part_id])
         
         return breakdown
         
     def get_timing_analysis(self):
         """Get timing analysis from MIDI data"""
-        midi_notes = [n for n in self.universal_notes if n.midi_data]
-        if not midi_notes:
+        start_times = []
+        end_times = []
+        durations = []
+        for note in self.universal_notes:
+            midi_data = note.midi_data
+            if midi_data:
+                start_times.append(midi_data.start_time_seconds)
+                end_times.append(midi_data.end_time_seconds)
+                durations.append(midi_data.duration_seconds)
+        
+        if not durations:
             return {}
-            
-        start_times = [n.midi_data.start_time_seconds for n in midi_notes]
-        durations = [n.midi_data.duration_seconds for n in midi_notes]
         
         return {
-            'total_duration': max(n.midi_data.end_time_seconds for n in midi_notes) if midi_notes else 0,
-            'earliest_note': min(start_times) if start_times else 0,
-            'average_duration': sum(durations) / len(durations) if durations else 0,
-            'shortest_note': min(durations) if durations else 0,
-            'longest_note': max(durations) if durations else 0
+            'total_duration': max(end_times),
+            'earliest_note': min(start_times),
+            'average_duration': sum(durations) / len(durations),
+            'shortest_note': min(durations),
+            'longest_note': max(durations)
         }
         
     def get_coordinate_ranges(self):
         """Get SVG coordinate ranges"""
         if not self.svg_notes:
             return {}
-            
-        x_coords = [n.svg_x for n in self.svg_notes]
-        y_coords = [n.svg_y for n in self.svg_notes]
+        
+        first = self.svg_notes[0]
+        min_x = max_x = first.svg_x
+        min_y = max_y = first.svg_y
+        staff_counts = Counter()
+        
+        for note in self.svg_notes:
+            svg_x = note.svg_x
+            svg_y = note.svg_y
+            if svg_x < min_x:
+                min_x = svg_x
+            elif svg_x > max_x:
+                max_x = svg_x
+            if svg_y < min_y:
+                min_y = svg_y
+            elif svg_y > max_y:
+                max_y = svg_y
+            staff_counts[note.staff_index] += 1
         
         return {
-            'x_range': {'min': min(x_coords), 'max': max(x_coords)},
-            'y_range': {'min': min(y_coords), 'max': max(y_coords)},
+            'x_range': {'min': min_x, 'max': max_x},
+            'y_range': {'min': min_y, 'max': max_y},
             'staff_distribution': {
-                str(i): len([n for n in self.svg_notes if n.staff_index == i])
-                for i in set(n.staff_index for n in self.svg_notes)
+                str(i): staff_counts[i] for i in sorted(staff_counts)
             }
         }
         
@@ -519,28 +726,21 @@ class NoteCoordinator:
         """Save all coordination data to output directory"""
         os.makedirs(output_dir, exist_ok=True)
         
-        # Universal notes registry
+        # Universal notes registry (dataclasses are serialized directly)
         universal_data = {
-            'notes': [asdict(note) for note in self.universal_notes]
+            'notes': self.universal_notes
         }
         
-        with open(os.path.join(output_dir, 'universal_notes_registry.json'), 'w') as f:
-            json.dump(universal_data, f, indent=2, default=str)
+        write_json(os.path.join(output_dir, 'universal_notes_registry.json'), universal_data)
         
-        # Pipeline manifests
-        manifests = self.generate_pipeline_manifests()
-        
-        with open(os.path.join(output_dir, 'midi_pipeline_manifest.json'), 'w') as f:
-            json.dump(manifests['midi_pipeline'], f, indent=2)
-            
-        with open(os.path.join(output_dir, 'svg_pipeline_manifest.json'), 'w') as f:
-            json.dump(manifests['svg_pipeline'], f, indent=2)
+        # Pipeline manifests (streamed record by record)
+        write_json_records(os.path.join(output_dir, 'midi_pipeline_manifest.json'), self.iter_midi_manifest())
+        write_json_records(os.path.join(output_dir, 'svg_pipeline_manifest.json'), self.iter_svg_manifest())
         
         # Comprehensive metadata
         metadata = self.generate_comprehensive_metadata(musicxml_file, midi_file)
         
-        with open(os.path.join(output_dir, 'coordination_metadata.json'), 'w') as f:
-            json.dump(metadata, f, indent=2, default=str)
+        write_json(os.path.join(output_dir, 'coordination_metadata.json'), metadata)
         
         print(f"💾 Saved coordination data to: {output_dir}")
         print(f"   📋 universal_notes_registry.json - Complete note registry")
@@ -9,16 +9,40 @@ preserving Universal ID integrity.
 
 import json
 import os
+import re
 from pathlib import Path
 from typing import Dict, List, Optional, Set, Any
 from dataclasses import dataclass, asdict
 from datetime import datetime
 
+try:
+    import orjson  # Rust-backed parser, reads registry bytes directly
+except ImportError:
+    orjson = None
+
 # Import UniversalNote from note_coordinator for compatibility
 import sys
 
 sys.path.append(os.path.join(os.path.dirname(__file__), ".."))
 
+# Patterns used to reduce filenames to a general category pattern
+DIGITS_PATTERN = re.compile(r"\d+")
+UUID_FRAGMENT_PATTERN = re.compile(r"[a-f0-9]{4,}")
+
+
+def read_json(file_path: Path) -> Any:
+    """Load a JSON file, parsing its raw bytes with orjson when available"""
+    raw = file_path.read_bytes()
+    if orjson is not None:
+        try:
+            return orjson.loads(raw)
+        except orjson.JSONDecodeError:
+            # NaN/Infinity written by the stdlib encoder are rejected by orjson
+            pass
+
+    # Bytes are decoded as UTF-8 (or UTF-16/32 by BOM), never the locale encoding
+    return json.loads(raw)
+
 
 @dataclass
 class FileRegistration:
@@ -116,8 +140,7 @@ class UniversalFileRegistry:
 
         # Load universal notes registry
         if universal_notes_registry_path.exists():
-            with open(universal_notes_registry_path, "r") as f:
-                universal_data = json.load(f)
+            universal_data = read_json(universal_notes_registry_path)
 
             # Create UniversalIDRecord for each note
             for note_data in universal_data.get("notes", []):
@@ -166,8 +189,7 @@ class UniversalFileRegistry:
         """Integrate MIDI pipeline manifest into registry"""
         print(f"   🎵 Integrating MIDI manifest: {midi_manifest_path}")
 
-        with open(midi_manifest_path, "r") as f:
-            midi_manifest = json.load(f)
+        midi_manifest = read_json(midi_manifest_path)
 
         for entry in midi_manifest:
             universal_id = entry.get("universal_id")
@@ -197,8 +219,7 @@ class UniversalFileRegistry:
         """Integrate SVG pipeline manifest into registry"""
         print(f"   🖼️  Integrating SVG manifest: {svg_manifest_path}")
 
-        with open(svg_manifest_path, "r") as f:
-            svg_manifest = json.load(f)
+        svg_manifest = read_json(svg_manifest_path)
 
         for entry in svg_manifest:
             universal_id = entry.get("universal_id")
@@ -339,10 +360,8 @@ class UniversalFileRegistry:
     def _extract_filename_pattern(self, filename: str) -> str:
         """Extract filename pattern for categorization"""
         # Remove numbers and UUIDs to get general pattern
-        import re
-
-        pattern = re.sub(r"\d+", "N", filename)
-        pattern = re.sub(r"[a-f0-9]{4,}", "UUID", pattern)
+        pattern = DIGITS_PATTERN.sub("N", filename)
+        pattern = UUID_FRAGMENT_PATTERN.sub("UUID", pattern)
         return pattern
 
     def get_universal_id_files(self, universal_id: str) -> Dict[str, FileRegistration]:
@@ -443,30 +462,29 @@ class UniversalFileRegistry:
         """Get comprehensive statistics about the registry"""
         total_records = len(self.universal_records)
 
-        # Count registrations by stage
+        # Single pass: stage completions, files by stage, matches and recency
         stage_counts: Dict[str, int] = {}
+        file_counts: Dict[str, int] = {}
+        total_files = 0
+        matched_count = 0
+        confidences: List[float] = []
+        last_updated: Optional[datetime] = None
         for record in self.universal_records.values():
             for stage in record.pipeline_stages_completed:
                 stage_counts[stage] = stage_counts.get(stage, 0) + 1
 
-        # Count files by stage
-        file_counts: Dict[str, int] = {}
-        total_files = 0
-        for record in self.universal_records.values():
-            for stage_name, file_reg in record.file_registrations.items():
+            for stage_name in record.file_registrations:
                 file_counts[stage_name] = file_counts.get(stage_name, 0) + 1
-                total_files += 1
+            total_files += len(record.file_registrations)
 
-        # Calculate match statistics
-        matched_count = sum(
-            1 for r in self.universal_records.values() if r.midi_data is not None
-        )
-        avg_confidence = (
-            sum(r.match_confidence for r in self.universal_records.values())
-            / total_records
-            if total_records > 0
-            else 0
-        )
+            if record.midi_data is not None:
+                matched_count += 1
+            confidences.append(record.match_confidence)
+
+            if last_updated is None or record.last_updated > last_updated:
+                last_updated = record.last_updated
+
+        avg_confidence = sum(confidences) / total_records if total_records > 0 else 0
 
         return {
             "total_universal_ids": total_records,
@@ -477,10 +495,7 @@ class UniversalFileRegistry:
             "stage_completion_counts": stage_counts,
             "file_counts_by_stage": file_counts,
             "filename_transformations": len(self.filename_transformations),
-            "last_updated": max(
-                (r.last_updated for r in self.universal_records.values()),
-                default=datetime.now(),
-            ),
+            "last_updated": last_updated or datetime.now(),
         }
 
     def save_registry(self, file_path: Optional[Path] = None):
@@ -531,8 +546,7 @@ class UniversalFileRegistry:
             print(f"⚠️  Registry file not found: {load_path}")
             return
 
-        with open(load_path, "r") as f:
-            registry_data = json.load(f)
+        registry_data = read_json(load_path)
 
         # Load universal records
         for universal_id, record_data in registry_data.get(
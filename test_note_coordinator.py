@@ -0,0 +1,205 @@
+#!/usr/bin/env python3
+"""
+Basic tests for note_coordinator module
+"""
+
+import pytest
+import tempfile
+import xml.etree.ElementTree
+from pathlib import Path
+
+import mido
+
+import note_coordinator
+from note_coordinator import NoteCoordinator
+
+PARTWISE_XML = """<?xml version="1.0" encoding="UTF-8"?>
+<score-partwise version="3.1">
+  <part-list>
+    <score-part id="P1"><part-name>Flute</part-name></score-part>
+    <score-part id="P2"><part-name>Cello</part-name></score-part>
+  </part-list>
+  <part id="P2">
+    <measure number="1" width="200">
+      <note default-x="10"><pitch><step>C</step><octave>3</octave></pitch><type>half</type></note>
+      <note><rest/><type>half</type></note>
+    </measure>
+    <measure number="2" width="150">
+      <note default-x="20"><pitch><step>E</step><octave>3</octave></pitch></note>
+    </measure>
+  </part>
+</score-partwise>
+"""
+
+TIMEWISE_XML = """<?xml version="1.0" encoding="UTF-8"?>
+<score-timewise version="3.1">
+  <part-list>
+    <score-part id="P1"><part-name>Flute</part-name></score-part>
+  </part-list>
+  <measure number="1">
+    <part id="P1">
+      <note><pitch><step>A</step><octave>4</octave></pitch><type>quarter</type></note>
+    </part>
+  </measure>
+</score-timewise>
+"""
+
+
+@pytest.fixture(params=["default", "stdlib"])
+def xml_parser(request, monkeypatch):
+    """Run XML tests with the module's parser (lxml when installed) and with ElementTree"""
+    if request.param == "stdlib":
+        monkeypatch.setattr(note_coordinator, "ET", xml.etree.ElementTree)
+    return request.param
+
+
+def load_xml(content: str):
+    """Load XML notes through NoteCoordinator from a MusicXML string"""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        xml_path = Path(temp_dir) / "score.musicxml"
+        xml_path.write_text(content, encoding="utf-8")
+
+        coordinator = NoteCoordinator()
+        coordinator.load_xml_notes(str(xml_path))
+        return coordinator.xml_notes
+
+
+def write_midi(path: Path, messages, ticks_per_beat: int = 480):
+    """Write a single-track MIDI file from (delta_ticks, message) pairs"""
+    mid = mido.MidiFile(ticks_per_beat=ticks_per_beat)
+    track = mido.MidiTrack()
+    track.append(mido.MetaMessage('track_name', name='Flute', time=0))
+    for delta, msg in messages:
+        track.append(msg.copy(time=delta))
+    mid.tracks.append(track)
+    mid.save(path)
+
+
+def load_notes(messages):
+    """Load MIDI notes through NoteCoordinator from the given track messages"""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        midi_path = Path(temp_dir) / "tempo.mid"
+        write_midi(midi_path, messages)
+
+        coordinator = NoteCoordinator()
+        coordinator.load_midi_notes(str(midi_path))
+        return coordinator.midi_notes
+
+
+def test_load_midi_notes_multi_tempo_track():
+    """Tempo changes inside a track apply from their tick onwards"""
+    notes = load_notes([
+        (0, mido.MetaMessage('set_tempo', tempo=500000)),     # 120 BPM
+        (0, mido.Message('note_on', note=60, velocity=80)),
+        (960, mido.MetaMessage('set_tempo', tempo=1000000)),  # 60 BPM at beat 2
+        (480, mido.Message('note_off', note=60)),
+        (0, mido.Message('note_on', note=62, velocity=80)),
+        (480, mido.MetaMessage('set_tempo', tempo=250000)),   # 240 BPM at beat 4
+        (480, mido.Message('note_off', note=62)),
+    ])
+
+    assert [note.pitch_name for note in notes] == ["C4", "D4"]
+
+    # C4 spans the 120 -> 60 BPM change: 2 beats at 0.5s + 1 beat at 1.0s
+    c4 = notes[0]
+    assert c4.start_time_seconds == pytest.approx(0.0)
+    assert c4.end_time_seconds == pytest.approx(2.0)
+    assert c4.duration_seconds == pytest.approx(2.0)
+
+    # D4 spans the 60 -> 240 BPM change: 1 beat at 1.0s + 1 beat at 0.25s
+    d4 = notes[1]
+    assert d4.start_time_seconds == pytest.approx(2.0)
+    assert d4.end_time_seconds == pytest.approx(3.25)
+    assert d4.duration_seconds == pytest.approx(1.25)
+    assert d4.duration_ticks == 960
+
+
+def test_load_midi_notes_matches_mido_timing():
+    """Converted note onsets agree with mido's own tempo-aware playback times"""
+    messages = [
+        (0, mido.MetaMessage('set_tempo', tempo=600000)),
+        (120, mido.Message('note_on', note=64, velocity=90)),
+        (300, mido.MetaMessage('set_tempo', tempo=400000)),
+        (200, mido.Message('note_off', note=64)),
+        (90, mido.Message('note_on', note=67, velocity=90)),
+        (700, mido.MetaMessage('set_tempo', tempo=900000)),
+        (50, mido.Message('note_off', note=67)),
+    ]
+    notes = load_notes(messages)
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        midi_path = Path(temp_dir) / "tempo.mid"
+        write_midi(midi_path, messages)
+        elapsed = 0.0
+        expected = []
+        for msg in mido.MidiFile(midi_path):
+            elapsed += msg.time
+            if msg.type in ('note_on', 'note_off'):
+                expected.append(elapsed)
+
+    actual = []
+    for note in notes:
+        actual.extend([note.start_time_seconds, note.end_time_seconds])
+    assert actual == pytest.approx(expected)
+
+
+def test_load_midi_notes_defaults_to_120_bpm():
+    """A track without set_tempo messages is timed at 120 BPM"""
+    notes = load_notes([
+        (480, mido.Message('note_on', note=69, velocity=64)),
+        (480, mido.Message('note_off', note=69)),
+    ])
+
+    assert len(notes) == 1
+    assert notes[0].pitch_name == "A4"
+    assert notes[0].start_time_seconds == pytest.approx(0.5)
+    assert notes[0].end_time_seconds == pytest.approx(1.0)
+    assert notes[0].duration_seconds == pytest.approx(0.5)
+
+
+def test_midi_to_note_name_any_note_number():
+    """Note names follow the same arithmetic inside and outside 0-127"""
+    coordinator = NoteCoordinator()
+
+    assert coordinator.midi_to_note_name(60) == "C4"
+    assert coordinator.midi_to_note_name(69) == "A4"
+    assert coordinator.midi_to_note_name(0) == "C-1"
+    assert coordinator.midi_to_note_name(127) == "G9"
+    assert coordinator.midi_to_note_name(-1) == "B-2"
+    assert coordinator.midi_to_note_name(128) == "G#9"
+
+
+def test_load_xml_notes_partwise(xml_parser):
+    """Pitched notes are read per part with staff index and cumulative x"""
+    notes = load_xml(PARTWISE_XML)
+
+    assert [note.note_name for note in notes] == ["C3", "E3"]
+    assert [note.measure for note in notes] == [1, 2]
+    assert [note.duration for note in notes] == ["half", "quarter"]
+    assert all(note.part_id == "P2" and note.staff_index == 1 for note in notes)
+    assert notes[1].absolute_x == 220.0
+
+
+def test_load_xml_notes_timewise_yields_no_notes(xml_parser):
+    """A score-timewise file (parts inside measures) is not misread or crashed on"""
+    assert load_xml(TIMEWISE_XML) == []
+
+
+def test_match_xml_to_midi_enharmonic_spelling():
+    """An XML note spelled with a flat matches the MIDI note of the same pitch"""
+    coordinator = NoteCoordinator()
+    coordinator.xml_notes.append(note_coordinator.XMLNote(
+        part_id="P1", measure=1, step="Db", octave=4, duration="quarter",
+        xml_x=0.0, xml_y=0.0, absolute_x=0.0, note_name="Db4", staff_index=0,
+    ))
+    coordinator.midi_notes.append(note_coordinator.MIDINote(
+        track_index=0, track_name="Flute", pitch_midi=61, pitch_name="C#4",
+        velocity=64, start_time_seconds=0.0, end_time_seconds=0.5,
+        duration_seconds=0.5, start_time_ticks=0, end_time_ticks=480,
+        duration_ticks=480, channel=0,
+    ))
+
+    [(xml_note, midi_note, confidence, method)] = coordinator.match_xml_to_midi()
+
+    assert midi_note is coordinator.midi_notes[0]
+    assert (confidence, method) == (0.7, "enharmonic")